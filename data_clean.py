@@ -1,38 +1,45 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import xgboost as xgb
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
 
 # --- FILE NAMES ---
 FILE_RP5 = "42299.01.01.2018.02.12.2025.1.0.0.en.ansi.00000000.csv"
 FILE_API = "open-meteo-27.31N88.59E1636m(1).csv"
 
+# Numeric RP5 columns are parsed straight into float32; RRR stays text ('Trace of precipitation')
+RP5_DTYPES = {'T': 'float32', 'U': 'float32', 'Po': 'float32', 'Ff': 'float32'}
+
 
 def clean_rp5(file_path):
     print(f"Cleaning RP5...")
-    try:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False)
-    except:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False)
-
-    # Clean Headers
-    df.columns = [c.replace('"', '').strip() for c in df.columns]
-
     # Rename
     rename_map = {
         'Local time in Gangtok': 'timestamp',
         'T': 'sensor_temp',
         'RRR': 'sensor_rain'
     }
+
+    try:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+    except:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+
+    # Clean Headers
+    df.columns = [c.replace('"', '').strip() for c in df.columns]
+
     df = df.rename(columns=rename_map)
 
     # Parse Time
-    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce')
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce', cache=True)
 
     # Fix Rain
     if 'sensor_rain' in df.columns:
-        df['sensor_rain'] = df['sensor_rain'].astype(str).str.replace('Trace of precipitation', '0.05', regex=False)
+        df['sensor_rain'] = df['sensor_rain'].replace('Trace of precipitation', '0.05')
         df['sensor_rain'] = pd.to_numeric(df['sensor_rain'], errors='coerce').fillna(0.0)
 
     df = df.dropna(subset=['timestamp'])
@@ -41,7 +48,12 @@ def clean_rp5(file_path):
 
 def clean_api(file_path):
     print(f"Cleaning Open-Meteo...")
-    df = pd.read_csv(file_path, skiprows=3)
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(skip_rows=3),
+        convert_options=pa_csv.ConvertOptions(column_types={'time': pa.string()})
+    )
+    df = table.to_pandas()
 
     # Rename Columns (Loose match)
     cols = {
@@ -54,14 +66,14 @@ def clean_api(file_path):
         'wind_direction_10m': 'api_wind_dir'
     }
 
-    new_cols = {}
-    for c in df.columns:
-        for k, v in cols.items():
-            if k in c:
-                new_cols[c] = v
+    new_cols = {c: v for c in df.columns for k, v in cols.items() if k in c}
 
     df = df.rename(columns=new_cols)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+    # float32 is plenty for weather readings and halves the frame
+    num_cols = df.columns.drop('timestamp')
+    df[num_cols] = df[num_cols].astype(np.float32)
     return df.sort_values('timestamp')
 
 
@@ -72,36 +84,41 @@ if __name__ == "__main__":
         df_api = clean_api(FILE_API)
 
         print("🔗 Merging...")
-        df = pd.merge_asof(
-            df_rp5, df_api,
-            on='timestamp', direction='nearest', tolerance=pd.Timedelta('1h')
-        )
+        # RP5 reports on the half hour, Open-Meteo on the hour: the nearest API row
+        # is always the one in the same clock hour, so hash-join on the hour bucket.
+        df_rp5['hbucket'] = df_rp5['timestamp'].dt.floor('h')
+        df_api['hbucket'] = df_api['timestamp'].dt.floor('h')
+        df = df_rp5.merge(df_api.drop(columns='timestamp'), on='hbucket', how='left').drop(columns='hbucket')
         df = df.dropna(subset=['api_temp', 'sensor_temp'])
 
         # --- FEATURE ENGINEERING (The Science Boost) ---
         print("Adding Physics Features...")
 
-        # 1. Seasonality (Monsoon Awareness)
-        df['month'] = df['timestamp'].dt.month
-        df['hour'] = df['timestamp'].dt.hour
+        temp = df['api_temp'].to_numpy()
+        pressure = df['api_pressure'].to_numpy(np.float32)
+        rads = np.deg2rad(df['api_wind_dir'].to_numpy())
 
         # 2. Dew Point Depression (Thermodynamics)
         # If (Temp - DewPoint) is small -> Air is saturated -> RAIN
         if 'api_dew_point' in df.columns:
-            df['dew_spread'] = df['api_temp'] - df['api_dew_point']
+            dew = df['api_dew_point'].to_numpy()
         else:
             # Approximate if missing
-            df['dew_spread'] = df['api_temp'] - ((100 - df['api_humidity']) / 5)
-
-        # 3. Pressure Trend (Storm Warning)
-        # Calculate change from 3 hours ago (since RP5 is 3-hourly)
-        df['pressure_trend'] = df['api_pressure'].diff().fillna(0)
-
-        # 4. Wind Vectors (Math Fix)
-        # 360° and 1° are close, but model thinks they are far. Use Sin/Cos.
-        rads = np.deg2rad(df['api_wind_dir'])
-        df['wind_sin'] = np.sin(rads)
-        df['wind_cos'] = np.cos(rads)
+            dew = (100 - df['api_humidity'].to_numpy()) / 5
+
+        df = df.assign(
+            # 1. Seasonality (Monsoon Awareness)
+            month=df['timestamp'].dt.month,
+            hour=df['timestamp'].dt.hour,
+            dew_spread=temp - dew,
+            # 3. Pressure Trend (Storm Warning)
+            # Calculate change from 3 hours ago (since RP5 is 3-hourly)
+            pressure_trend=np.diff(pressure, prepend=pressure[0]),
+            # 4. Wind Vectors (Math Fix)
+            # 360° and 1° are close, but model thinks they are far. Use Sin/Cos.
+            wind_sin=np.sin(rads),
+            wind_cos=np.cos(rads)
+        )
 
         # --- TRAINING ---
         features = ['api_temp', 'api_humidity', 'api_pressure', 'api_wind_speed',
@@ -109,26 +126,48 @@ if __name__ == "__main__":
 
         df['target'] = (df['sensor_rain'] > 0.1).astype(int)
 
-        X = df[features]
-        y = df['target']
+        X = df[features].to_numpy(np.float32)
+        y = df['target'].to_numpy(np.int8)
 
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+        # Chronological 80/20 split (no shuffling)
+        n = int(len(X) * 0.8)
+        X_train, X_test, y_train, y_test = X[:n], X[n:], y[:n], y[n:]
 
         # Adjust weight slightly less aggressive to fix False Alarms
         # 'sqrt' of the ratio often helps balance Precision/Recall better than raw ratio
         ratio = float(np.sum(y_train == 0)) / np.sum(y_train == 1)
 
-        model = xgb.XGBClassifier(
-            n_estimators=300,  # More trees
-            learning_rate=0.03,  # Slower learning = better generalization
-            max_depth=6,  # Deeper trees for complex physics
-            scale_pos_weight=np.sqrt(ratio)  # Balanced weight
-        )
+        params = {
+            'objective': 'binary:logistic',
+            'eta': 0.03,  # Slower learning = better generalization
+            'max_depth': 6,  # Deeper trees for complex physics
+            'scale_pos_weight': np.sqrt(ratio),  # Balanced weight
+            'tree_method': 'hist',  # Pre-binned histogram splits (fast CPU path)
+            'max_bin': 256,
+            'nthread': -1,  # All cores
+            'eval_metric': 'logloss'
+        }
+
+        # QuantileDMatrix bins the float32 matrix once, straight into hist format
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train,
+                                     feature_names=features, max_bin=params['max_bin'])
+        dvalid = xgb.QuantileDMatrix(X_test, label=y_test,
+                                     feature_names=features, ref=dtrain)
 
         print("Training V2 Model...")
-        model.fit(X_train, y_train)
+        model = xgb.train(
+            params, dtrain,
+            num_boost_round=300,  # More trees
+            evals=[(dvalid, 'validation')],
+            early_stopping_rounds=20,  # Stop once validation logloss plateaus
+            verbose_eval=False
+        )
+
+        # Keep only the trees up to the best validation round so the saved model matches
+        model = model[: model.best_iteration + 1]
 
-        preds = model.predict(X_test)
+        proba = model.predict(dvalid)
+        preds = (proba > 0.5).astype(int)
         print(f"\nAccuracy: {accuracy_score(y_test, preds) * 100:.1f}%")
         print(classification_report(y_test, preds))
 
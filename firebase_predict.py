@@ -1,7 +1,8 @@
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 import xgboost as xgb
 import numpy as np
+import asyncio
 from datetime import datetime
 import firebase_admin
 from firebase_admin import credentials, db
@@ -9,14 +10,21 @@ from firebase_admin import credentials, db
 # ---------------------------------------------------------------------
 #                       FIREBASE INITIALIZATION
 # ---------------------------------------------------------------------
-cred = credentials.Certificate("agrosmart-f6758-firebase-adminsdk-fbsvc-ead2ed827d.json")
-firebase_admin.initialize_app(cred, {
-    "databaseURL": "https://agrosmart-f6758-default-rtdb.firebaseio.com/"
-})
+SERVICE_ACCOUNT_FILE = "agrosmart-f6758-firebase-adminsdk-fbsvc-ead2ed827d.json"
+DATABASE_URL = "https://agrosmart-f6758-default-rtdb.firebaseio.com/"
 
 WEATHER_PATH = "Niranj/WeatherData"   # Confirmed from uploaded DB
 
 
+def init_firebase():
+    # Set up the admin app on first use only; later calls reuse it
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(SERVICE_ACCOUNT_FILE)
+        firebase_admin.initialize_app(cred, {
+            "databaseURL": DATABASE_URL
+        })
+
+
 # ---------------------------------------------------------------------
 #                       MODEL + API PARAMETERS
 # ---------------------------------------------------------------------
@@ -27,11 +35,37 @@ LON = 88.59
 # Constant pressure (your requirement)
 FIXED_PRESSURE = 1020.0
 
+# Pooled keep-alive session, so repeated fetches skip the TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Open-Meteo responses keyed by the hour they were fetched in
+_FORECAST_CACHE = {}
+
+FEATURE_ORDER = (
+    'api_temp', 'api_humidity', 'api_pressure', 'api_wind_speed',
+    'api_dew_spread', 'pressure_trend', 'wind_sin', 'wind_cos',
+    'sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed',
+    'sensor_dew_spread',
+    'month', 'hour', 'pressure_diff', 'temp_diff'
+)
+
+# Column positions in FEATURE_ORDER (must match the training feature list)
+(A_TEMP, A_HUM, A_PRES, A_WSPD,
+ A_DEW_SPREAD, P_TREND, WIND_SIN, WIND_COS,
+ S_TEMP, S_HUM, S_PRES, S_WSPD,
+ S_DEW_SPREAD,
+ MONTH, HOUR, P_DIFF, T_DIFF) = range(len(FEATURE_ORDER))
+
+# How often the service re-runs the prediction
+RUN_INTERVAL_SECONDS = 3 * 60
+
 
 # ---------------------------------------------------------------------
 #                     READ WEATHER DATA FROM FIREBASE
 # ---------------------------------------------------------------------
 def read_weather_from_firebase():
+    init_firebase()
     ref = db.reference(WEATHER_PATH)
     data = ref.get()
 
@@ -58,6 +92,7 @@ def read_weather_from_firebase():
 #                     WRITE RAIN PERCENT BACK TO FIREBASE
 # ---------------------------------------------------------------------
 def write_rain_percent_to_firebase(rain_percent):
+    init_firebase()
     ref = db.reference(f"{WEATHER_PATH}/RainPercent")
     ref.set(rain_percent)
     print(f"Updated Firebase → RainPercent = {rain_percent}")
@@ -76,8 +111,17 @@ def get_live_forecast():
     )
 
     try:
-        r = requests.get(url).json()
         current_hour_iso = datetime.now().strftime("%Y-%m-%dT%H:00")
+        r = _FORECAST_CACHE.get(current_hour_iso)
+        if r is None:
+            resp = _SESSION.get(url, timeout=5)
+            resp.raise_for_status()
+            r = resp.json()
+            # Only cache a body that actually carries the hourly forecast
+            if 'hourly' not in r:
+                raise ValueError(f"no hourly data in response: {r.get('reason', r)}")
+            _FORECAST_CACHE.clear()
+            _FORECAST_CACHE[current_hour_iso] = r
         hourly_times = r['hourly']['time']
 
         try:
@@ -100,88 +144,98 @@ def get_live_forecast():
 
 
 # ---------------------------------------------------------------------
-#                                 MAIN
+#                              PREDICTOR
 # ---------------------------------------------------------------------
-def main():
-    print(f"\nSIKKIM RAIN PREDICTOR – {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+class Predictor:
+    """Loads the booster once and reuses a single-row input buffer."""
+
+    def __init__(self, model_file=MODEL_FILE):
+        self.model = xgb.Booster()
+        self.model.load_model(model_file)
+        self.buf = np.empty(len(FEATURE_ORDER), dtype=np.float32)
+
+    def predict(self, api_data, sensor_data):
+        current_time = datetime.now()
+        rads = np.deg2rad(api_data['api_wind_dir'])
+
+        # Derived physics variables
+        api_dew_spread = api_data['api_temp'] - api_data['api_dew_point']
+        sensor_dew_spread = sensor_data['sensor_temp'] - ((100 - sensor_data['sensor_humidity']) / 5)
+
+        pressure_diff = api_data['api_pressure'] - sensor_data['sensor_pressure']
+        temp_diff = api_data['api_temp'] - sensor_data['sensor_temp']
+        pressure_trend = 0.0
+
+        x = self.buf
+        x[A_TEMP] = api_data['api_temp']
+        x[A_HUM] = api_data['api_humidity']
+        x[A_PRES] = api_data['api_pressure']
+        x[A_WSPD] = api_data['api_wind_speed']
+        x[A_DEW_SPREAD] = api_dew_spread
+        x[P_TREND] = pressure_trend
+        x[WIND_SIN] = np.sin(rads)
+        x[WIND_COS] = np.cos(rads)
+        x[S_TEMP] = sensor_data['sensor_temp']
+        x[S_HUM] = sensor_data['sensor_humidity']
+        x[S_PRES] = sensor_data['sensor_pressure']
+        x[S_WSPD] = sensor_data['sensor_wind_speed']
+        x[S_DEW_SPREAD] = sensor_dew_spread
+        x[MONTH] = current_time.month
+        x[HOUR] = current_time.hour
+        x[P_DIFF] = pressure_diff
+        x[T_DIFF] = temp_diff
+
+        return self.model.inplace_predict(x.reshape(1, -1))[0]
+
+    async def predict_and_upload(self):
+        print(f"\nSIKKIM RAIN PREDICTOR – {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+
+        # Get live forecast and weather data from Firebase (instead of local sensors)
+        # at the same time: both are blocking network calls, so overlap them
+        try:
+            api_data, sensor_data = await asyncio.gather(
+                asyncio.to_thread(get_live_forecast),
+                asyncio.to_thread(read_weather_from_firebase)
+            )
+        except Exception as e:
+            print(f"FIREBASE READ ERROR: {e}")
+            return
+        if not api_data:
+            return
+
+        probability = self.predict(api_data, sensor_data)
+        rain_percentage = int(probability * 100)
+
+        print("\n========= FORECAST =========")
+        print(f"API: {api_data['api_temp']}°C / {api_data['api_humidity']}% RH")
+        print(f"Firebase Sensor: {sensor_data['sensor_temp']}°C / {sensor_data['sensor_humidity']}% RH")
+        print(f"Dew Spread: {self.buf[S_DEW_SPREAD]:.1f}")
+        print(f"Rain chance: {rain_percentage}%")
+        print("============================\n")
+
+        # Upload result to Firebase
+        await asyncio.to_thread(write_rain_percent_to_firebase, rain_percentage)
 
+
+# ---------------------------------------------------------------------
+#                                 MAIN
+# ---------------------------------------------------------------------
+async def main():
     # Load ML model
     try:
-        model = xgb.Booster()
-        model.load_model(MODEL_FILE)
+        predictor = Predictor()
     except Exception as e:
         print(f"Model load error: {e}")
         return
 
-    # Get live forecast
-    api_data = get_live_forecast()
-    if not api_data:
-        return
-
-    # Get weather data from Firebase (instead of local sensors)
-    sensor_data = read_weather_from_firebase()
-
-    current_time = datetime.now()
-    rads = np.deg2rad(api_data['api_wind_dir'])
-
-    # Derived physics variables
-    api_dew_spread = api_data['api_temp'] - api_data['api_dew_point']
-    sensor_dew_spread = sensor_data['sensor_temp'] - ((100 - sensor_data['sensor_humidity']) / 5)
-
-    pressure_diff = api_data['api_pressure'] - sensor_data['sensor_pressure']
-    temp_diff = api_data['api_temp'] - sensor_data['sensor_temp']
-    pressure_trend = 0.0
-
-    input_dict = {
-        'api_temp': api_data['api_temp'],
-        'api_humidity': api_data['api_humidity'],
-        'api_pressure': api_data['api_pressure'],
-        'api_wind_speed': api_data['api_wind_speed'],
-        'api_dew_spread': api_dew_spread,
-        'pressure_trend': pressure_trend,
-        'wind_sin': np.sin(rads),
-        'wind_cos': np.cos(rads),
-
-        'sensor_temp': sensor_data['sensor_temp'],
-        'sensor_humidity': sensor_data['sensor_humidity'],
-        'sensor_pressure': sensor_data['sensor_pressure'],
-        'sensor_wind_speed': sensor_data['sensor_wind_speed'],
-        'sensor_dew_spread': sensor_dew_spread,
-
-        'month': current_time.month,
-        'hour': current_time.hour,
-        'pressure_diff': pressure_diff,
-        'temp_diff': temp_diff
-    }
-
-    feature_order = [
-        'api_temp', 'api_humidity', 'api_pressure', 'api_wind_speed',
-        'api_dew_spread', 'pressure_trend', 'wind_sin', 'wind_cos',
-        'sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed',
-        'sensor_dew_spread',
-        'month', 'hour', 'pressure_diff', 'temp_diff'
-    ]
-
-    try:
-        input_df = pd.DataFrame([input_dict])[feature_order]
-    except KeyError as e:
-        print(f"Feature missing: {e}")
-        return
-
-    dmatrix = xgb.DMatrix(input_df)
-    probability = model.predict(dmatrix)[0]
-    rain_percentage = int(probability * 100)
-
-    print("\n========= FORECAST =========")
-    print(f"API: {api_data['api_temp']}°C / {api_data['api_humidity']}% RH")
-    print(f"Firebase Sensor: {sensor_data['sensor_temp']}°C / {sensor_data['sensor_humidity']}% RH")
-    print(f"Dew Spread: {sensor_dew_spread:.1f}")
-    print(f"Rain chance: {rain_percentage}%")
-    print("============================\n")
-
-    # Upload result to Firebase
-    write_rain_percent_to_firebase(rain_percentage)
+    while True:
+        # One failed cycle (RTDB/API hiccup) must not take the service down
+        try:
+            await predictor.predict_and_upload()
+        except Exception as e:
+            print(f"Prediction cycle error: {e}")
+        await asyncio.sleep(RUN_INTERVAL_SECONDS)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
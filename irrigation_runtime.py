@@ -0,0 +1,290 @@
+import numpy as np
+import math
+import datetime
+import functools
+import logging
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import firebase_admin
+from firebase_admin import credentials, db
+from firebase_admin._http_client import DEFAULT_RETRY_CONFIG
+
+try:
+    from numba import njit, vectorize
+except ImportError:  # numba is optional (e.g. on the Pi); run the kernels as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    def vectorize(*args, **kwargs):
+        return lambda func: np.vectorize(func, otypes=[np.float64])
+
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------
+#                          FIREBASE SETUP
+# ---------------------------------------------------------------------
+SERVICE_ACCOUNT_FILE = "agrosmart-f6758-firebase-adminsdk-fbsvc-ead2ed827d.json"
+DATABASE_URL = "https://agrosmart-f6758-default-rtdb.firebaseio.com/"
+
+FARM_ROOT = "Niranj/FarmData/Node1"   # Adjusted exactly as per uploaded JSON
+
+# Set up on first RTDB access, so importing the model doesn't need credentials
+_app = None
+_app_lock = threading.Lock()
+
+# Reference handles are reused by every read/write instead of rebuilt per call
+_NODE_REF = None
+_SOIL_TEMP_REF = None
+_SOIL_MOIST_REF = None
+
+
+def _get_app():
+    """Initialize the Firebase app and Node1 references once (thread-safe)."""
+    global _app, _NODE_REF, _SOIL_TEMP_REF, _SOIL_MOIST_REF
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                cred = credentials.Certificate(SERVICE_ACCOUNT_FILE)
+                app = firebase_admin.initialize_app(cred, {
+                    "databaseURL": DATABASE_URL
+                })
+                _NODE_REF = db.reference(FARM_ROOT)
+                _SOIL_TEMP_REF = db.reference(f"{FARM_ROOT}/SoilTemperature")
+                _SOIL_MOIST_REF = db.reference(f"{FARM_ROOT}/SoilMoisture")
+
+                # All three refs share one keep-alive AuthorizedSession; size its pool for the
+                # parallel reads plus background writes. Keep the SDK's own retry policy (any
+                # method incl. the PATCH write, and a proper Firebase error once retries run out)
+                _NODE_REF._client.session.mount("https://", HTTPAdapter(
+                    pool_connections=4, pool_maxsize=8, max_retries=DEFAULT_RETRY_CONFIG
+                ))
+                _app = app
+    return _app
+
+# The two field reads are independent round trips, so run them side by side
+_READ_POOL = ThreadPoolExecutor(max_workers=2)
+
+# Writes are fire-and-forget: nothing downstream waits on the RTDB ack
+_WRITE_POOL = ThreadPoolExecutor(max_workers=2)
+
+# Node1 readings keyed by path -> (fetched_at, value); reused for NODE_CACHE_TTL_SECONDS
+NODE_CACHE_TTL_SECONDS = 60
+_NODE_CACHE = {}
+
+
+# ---------------------------------------------------------------------
+#                         IRRIGATION MODEL
+# ---------------------------------------------------------------------
+SOIL_FC = 32.0
+SOIL_WP = 16.0
+SCHEDULE_NPZ = "schedule.npz"  # Built from maize_data.csv by schedule_loader.py
+AW_PER_PCT = (SOIL_FC - SOIL_WP) / 10000.0  # mm of water per % deficit per mm of root depth
+LATITUDE = 26.9
+LAT_RAD = math.radians(LATITUDE)
+
+
+@njit(cache=True, fastmath=True)
+def _ra_kernel(day_of_year):
+    """Extraterrestrial radiation Ra (MJ/m2/day) at LATITUDE for a day of year."""
+    dr = 1 + 0.033 * math.cos(2 * math.pi * day_of_year / 365)
+    declination = 0.409 * math.sin((2 * math.pi * day_of_year / 365) - 1.39)
+    ws = math.acos(-math.tan(LAT_RAD) * math.tan(declination))
+
+    return (24 * 60 / math.pi) * 0.0820 * dr * (
+        ws * math.sin(LAT_RAD) * math.sin(declination) +
+        math.cos(LAT_RAD) * math.cos(declination) * math.sin(ws)
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _ra_for_doy(day_of_year):
+    """Memoized Ra; only changes once a day."""
+    return _ra_kernel(day_of_year)
+
+
+@functools.lru_cache(maxsize=1)
+def _today_doy(date_key):
+    """Day of year for a date ordinal; called with today's ordinal, so it changes once a day."""
+    return date_key - datetime.date(datetime.date.fromordinal(date_key).year, 1, 1).toordinal() + 1
+
+
+@njit(cache=True, fastmath=True)
+def _estimate_et0(ra, t_max, t_min):
+    """Hargreaves reference ET0 (mm/day); works on scalars and on temperature arrays."""
+    t_mean = (t_max + t_min) / 2
+    return 0.0023 * ra * (t_mean + 17.8) * np.sqrt(t_max - t_min)
+
+
+@vectorize(["f8(i8,f8,f8)"], target="parallel", fastmath=True, cache=True)
+def et0_ufunc(day_of_year, t_max, t_min):
+    """Hargreaves ET0 (mm/day) at LATITUDE as a ufunc, for forecast arrays spanning several days."""
+    return _estimate_et0(_ra_kernel(day_of_year), t_max, t_min)
+
+
+class MaizeSmartIrrigation:
+    def __init__(self, schedule_path=SCHEDULE_NPZ):
+        if schedule_path.endswith(".csv"):
+            # Parse the CSV directly (pulls in pandas); the .npz path stays pandas-free
+            from schedule_loader import schedule_arrays
+            arrays = schedule_arrays(schedule_path)
+        else:
+            with np.load(schedule_path) as npz:
+                arrays = dict(npz)
+
+        # Column arrays for the per-tick stage lookup (stages are sorted and contiguous)
+        self._start = arrays["start"]
+        self._end = arrays["end"]
+        self._theta = arrays["theta_base"]
+        self._tmax_ref = arrays["temp_max_ref"]
+        self._root = arrays["root_depth"]
+        self._stage_names = arrays["stage"].astype(object)
+
+    def estimate_solar_radiation(self, day_of_year, t_max, t_min):
+        # Checked here, not in the kernel: numba's sqrt returns NaN where math.sqrt raises
+        if t_max < t_min:
+            raise ValueError("math domain error: t_max is below t_min")
+        et0 = float(_estimate_et0(_ra_for_doy(day_of_year), float(t_max), float(t_min)))
+        return round(et0, 2)
+
+    def calculate_3hr_update(self, day_after_sowing, t_current, t_max_forecast, t_min_forecast, moisture_current):
+        i = np.searchsorted(self._end, day_after_sowing, side="right")
+        if i >= len(self._end) or day_after_sowing < self._start[0]:
+            raise IndexError("day_after_sowing outside the crop schedule")
+
+        # Schedule columns are float32; do the per-tick math (and JSON writes) in Python floats
+        target = float(self._theta[i])
+
+        instant_overshoot = max(0, t_current - float(self._tmax_ref[i]))
+
+        day_of_year = _today_doy(datetime.date.today().toordinal())
+        est_et0 = self.estimate_solar_radiation(day_of_year, t_max_forecast, t_min_forecast)
+
+        # Branch-free: the comparison masks the buffer, clamping replaces the deficit guard
+        et_buffer = 5.0 * (est_et0 > 5.5)
+
+        final_target = min(90.0, target + (instant_overshoot * 2.0) + et_buffer)
+
+        deficit_pct = max(0.0, final_target - moisture_current)
+        water_mm = deficit_pct * AW_PER_PCT * float(self._root[i])
+
+        return {
+            "Stage": self._stage_names[i],
+            "Target_Moisture": round(final_target, 1),
+            "Current_Moisture": moisture_current,
+            "Water_Required_mm": round(water_mm, 2)
+        }
+
+    def calculate_3hr_update_batch(self, days, t_cur, t_max, t_min, moist):
+        """
+        Vectorized calculate_3hr_update for forecast sweeps / many farms.
+        Takes arrays (or scalars) and returns a record array, one row per input.
+        """
+        # Materialize the broadcast views: numba can't type them without a FutureWarning
+        days, t_cur, t_max, t_min, moist = (np.array(a) for a in np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(a, dtype=float)) for a in (days, t_cur, t_max, t_min, moist))
+        ))
+
+        idx = np.searchsorted(self._end, days, side="right")
+        if np.any(idx >= len(self._end)) or np.any(days < self._start[0]):
+            raise IndexError("day_after_sowing outside the crop schedule")
+
+        theta = self._theta[idx].astype(float)
+        tmax_ref = self._tmax_ref[idx].astype(float)
+        root = self._root[idx].astype(float)
+
+        overshoot = np.maximum(0, t_cur - tmax_ref)
+
+        if np.any(t_max < t_min):
+            raise ValueError("math domain error: t_max is below t_min")
+
+        day_of_year = _today_doy(datetime.date.today().toordinal())
+        est_et0 = np.round(_estimate_et0(_ra_for_doy(day_of_year), t_max, t_min), 2)
+
+        et_buffer = np.where(est_et0 > 5.5, 5.0, 0.0)
+
+        final_target = np.minimum(90.0, theta + (overshoot * 2.0) + et_buffer)
+
+        deficit = np.maximum(0.0, final_target - moist)
+        water_mm = deficit * AW_PER_PCT * root
+
+        return np.rec.fromarrays(
+            [self._stage_names[idx], np.round(final_target, 1), moist, np.round(water_mm, 2)],
+            names=["Stage", "Target_Moisture", "Current_Moisture", "Water_Required_mm"]
+        )
+
+
+# ---------------------------------------------------------------------
+#                   FIREBASE READ / WRITE FUNCTIONS
+# ---------------------------------------------------------------------
+
+def read_node1_data(force=False):
+    """Reads soil data from Niranj/FarmData/Node1 (cached; force=True refetches)."""
+    cached = _NODE_CACHE.get(FARM_ROOT)
+    if not force and cached is not None and time.time() - cached[0] < NODE_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    _get_app()
+
+    # Fetch only the two fields we use instead of the whole Node1 subtree
+    temp_future = _READ_POOL.submit(_SOIL_TEMP_REF.get)
+    moist_future = _READ_POOL.submit(_SOIL_MOIST_REF.get)
+    temp, moist = temp_future.result(), moist_future.result()
+
+    if temp is None and moist is None:
+        raise Exception("Firebase path does not exist.")
+
+    soil_temp = float(temp if temp is not None else 0)     # Exists in Node1
+    soil_moist = float(moist if moist is not None else 0)  # Exists in Node1
+
+    _NODE_CACHE[FARM_ROOT] = (time.time(), (soil_temp, soil_moist))
+    return soil_temp, soil_moist
+
+
+def _write_expected(expected_value):
+    _get_app()
+
+    # PATCH on the node, so sibling fields can later ride along in the same call
+    _NODE_REF.update({"expectedWater": expected_value})
+
+
+def _report_write(future, expected_value):
+    err = future.exception()
+    if err is not None:
+        log.error("Write of expectedWater = %s failed: %s", expected_value, err)
+    else:
+        log.info("Wrote expectedWater = %s", expected_value)
+
+
+def write_expected_moisture(expected_value):
+    """Write the expected moisture % to Firebase in the background; returns the Future."""
+    future = _WRITE_POOL.submit(_write_expected, expected_value)
+    future.add_done_callback(lambda f: _report_write(f, expected_value))
+    return future
+
+
+# ---------------------------------------------------------------------
+#                              MAIN
+# ---------------------------------------------------------------------
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    soil_temp, soil_moist = read_node1_data()
+    log.info("Soil Temp: %s", soil_temp)
+    log.info("Soil Moisture: %s", soil_moist)
+
+    irrigation = MaizeSmartIrrigation()
+
+    result = irrigation.calculate_3hr_update(
+        day_after_sowing=115,
+        t_current=soil_temp,
+        t_max_forecast=35,
+        t_min_forecast=22,
+        moisture_current=soil_moist
+    )
+
+    expected = result["Target_Moisture"]
+    write_expected_moisture(expected)
+
+    log.info("Irrigation Result: %s", result)
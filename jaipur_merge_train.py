@@ -1,22 +1,19 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import xgboost as xgb
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
 
 FILE_RP5 = "42348.01.01.2018.08.12.2025.1.0.0.en.ansi.00000000.csv"
 FILE_API = "open-meteo-26.82N75.55E380m(1).csv"
 
+# Numeric RP5 columns are parsed straight into float32; RRR stays text ('Trace of precipitation')
+RP5_DTYPES = {'T': 'float32', 'U': 'float32', 'Po': 'float32', 'Ff': 'float32'}
+
 
 def clean_rp5(file_path):
     print(f"Cleaning RP5 (Ground Truth)...")
-    try:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False)
-    except:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False)
-
-    df.columns = [c.replace('"', '').strip() for c in df.columns]
-
     rename_map = {
         'Local time in Jaipur / Sanganer (airport)': 'timestamp',
         'T': 'sensor_temp',
@@ -25,18 +22,27 @@ def clean_rp5(file_path):
         'Po': 'sensor_pressure',
         'Ff': 'sensor_wind_speed'
     }
+
+    try:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+    except:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+
+    df.columns = [c.replace('"', '').strip() for c in df.columns]
+
     df = df.rename(columns=rename_map)
 
-    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce')
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce', cache=True)
 
     if 'sensor_rain' in df.columns:
-        df['sensor_rain'] = df['sensor_rain'].astype(str).str.replace('Trace of precipitation', '0.05', regex=False)
+        df['sensor_rain'] = df['sensor_rain'].replace('Trace of precipitation', '0.05')
         df['sensor_rain'] = pd.to_numeric(df['sensor_rain'], errors='coerce').fillna(0.0)
 
-    cols_to_fix = ['sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed']
-    for col in cols_to_fix:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    cols_to_fix = [c for c in ['sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed']
+                   if c in df.columns]
+    df[cols_to_fix] = df[cols_to_fix].apply(pd.to_numeric, errors='coerce')
 
     df = df.dropna(subset=['timestamp'])
     return df.sort_values('timestamp')
@@ -44,7 +50,12 @@ def clean_rp5(file_path):
 
 def clean_api(file_path):
     print(f"Cleaning Open-Meteo...")
-    df = pd.read_csv(file_path, skiprows=3)
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(skip_rows=3),
+        convert_options=pa_csv.ConvertOptions(column_types={'time': pa.string()})
+    )
+    df = table.to_pandas()
 
     cols = {
         'time': 'timestamp',
@@ -56,14 +67,14 @@ def clean_api(file_path):
         'wind_direction_10m': 'api_wind_dir'
     }
 
-    new_cols = {}
-    for c in df.columns:
-        for k, v in cols.items():
-            if k in c:
-                new_cols[c] = v
+    new_cols = {c: v for c in df.columns for k, v in cols.items() if k in c}
 
     df = df.rename(columns=new_cols)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+    # float32 is plenty for weather readings and halves the frame
+    num_cols = df.columns.drop('timestamp')
+    df[num_cols] = df[num_cols].astype(np.float32)
     return df.sort_values('timestamp')
 
 if __name__ == "__main__":
@@ -72,31 +83,38 @@ if __name__ == "__main__":
         df_api = clean_api(FILE_API)
 
         print("Merging...")
-        df = pd.merge_asof(
-            df_rp5, df_api,
-            on='timestamp', direction='nearest', tolerance=pd.Timedelta('1h')
-        )
+        # RP5 reports on the half hour, Open-Meteo on the hour: the nearest API row
+        # is always the one in the same clock hour, so hash-join on the hour bucket.
+        df_rp5['hbucket'] = df_rp5['timestamp'].dt.floor('h')
+        df_api['hbucket'] = df_api['timestamp'].dt.floor('h')
+        df = df_rp5.merge(df_api.drop(columns='timestamp'), on='hbucket', how='left').drop(columns='hbucket')
 
         df = df.dropna(subset=['api_temp', 'sensor_temp', 'sensor_pressure', 'sensor_humidity'])
 
         print("Adding Sensor Fusion Features...")
 
-        df['month'] = df['timestamp'].dt.month
-        df['hour'] = df['timestamp'].dt.hour
-
-        rads = np.deg2rad(df['api_wind_dir'])
-        df['wind_sin'] = np.sin(rads)
-        df['wind_cos'] = np.cos(rads)
+        api_temp = df['api_temp'].to_numpy()
+        api_pressure = df['api_pressure'].to_numpy(np.float32)
+        sensor_temp = df['sensor_temp'].to_numpy()
+        sensor_humidity = df['sensor_humidity'].to_numpy()
+        rads = np.deg2rad(df['api_wind_dir'].to_numpy())
 
         if 'api_dew_point' in df.columns:
-            df['api_dew_spread'] = df['api_temp'] - df['api_dew_point']
+            api_dew = df['api_dew_point'].to_numpy()
         else:
-            df['api_dew_spread'] = df['api_temp'] - ((100 - df['api_humidity']) / 5)
-
-        df['sensor_dew_spread'] = df['sensor_temp'] - ((100 - df['sensor_humidity']) / 5)
-        df['pressure_diff'] = df['api_pressure'] - df['sensor_pressure']
-        df['temp_diff'] = df['api_temp'] - df['sensor_temp']
-        df['pressure_trend'] = df['api_pressure'].diff().fillna(0)
+            api_dew = (100 - df['api_humidity'].to_numpy()) / 5
+
+        df = df.assign(
+            month=df['timestamp'].dt.month,
+            hour=df['timestamp'].dt.hour,
+            wind_sin=np.sin(rads),
+            wind_cos=np.cos(rads),
+            api_dew_spread=api_temp - api_dew,
+            sensor_dew_spread=sensor_temp - ((100 - sensor_humidity) / 5),
+            pressure_diff=api_pressure - df['sensor_pressure'].to_numpy(),
+            temp_diff=api_temp - sensor_temp,
+            pressure_trend=np.diff(api_pressure, prepend=api_pressure[0])
+        )
 
         features = [
 
@@ -110,24 +128,44 @@ if __name__ == "__main__":
         # Target
         df['target'] = (df['sensor_rain'] > 0.1).astype(int)
 
-        X = df[features]
-        y = df['target']
+        X = df[features].to_numpy(np.float32)
+        y = df['target'].to_numpy(np.int8)
 
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+        # Chronological 80/20 split (no shuffling)
+        n = int(len(X) * 0.8)
+        X_train, X_test, y_train, y_test = X[:n], X[n:], y[:n], y[n:]
 
         ratio = float(np.sum(y_train == 0)) / np.sum(y_train == 1)
 
-        model = xgb.XGBClassifier(
-            n_estimators=300,
-            learning_rate=0.03,
-            max_depth=6,
-            scale_pos_weight=np.sqrt(ratio)
-        )
+        params = {
+            'objective': 'binary:logistic',
+            'eta': 0.03,
+            'max_depth': 6,
+            'scale_pos_weight': np.sqrt(ratio),
+            'tree_method': 'hist',
+            'max_bin': 256,
+            'nthread': -1,
+            'eval_metric': 'logloss'
+        }
+
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train,
+                                     feature_names=features, max_bin=params['max_bin'])
+        dvalid = xgb.QuantileDMatrix(X_test, label=y_test,
+                                     feature_names=features, ref=dtrain)
 
         print("Training Sensor Fusion Model...")
-        model.fit(X_train, y_train)
+        model = xgb.train(
+            params, dtrain,
+            num_boost_round=300,
+            evals=[(dvalid, 'validation')],
+            early_stopping_rounds=20,
+            verbose_eval=False
+        )
+
+        model = model[: model.best_iteration + 1]
 
-        preds = model.predict(X_test)
+        proba = model.predict(dvalid)
+        preds = (proba > 0.5).astype(int)
         print(f"\nAccuracy: {accuracy_score(y_test, preds) * 100:.1f}%")
         print(classification_report(y_test, preds))
 
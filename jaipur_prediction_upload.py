@@ -1,7 +1,8 @@
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 import xgboost as xgb
 import numpy as np
+import time
 from datetime import datetime
 
 import firebase_admin
@@ -15,6 +16,30 @@ SERVICE_ACCOUNT_FILE = "agrosmart-f6758-firebase-adminsdk-fbsvc-ead2ed827d.json"
 DATABASE_URL = "https://agrosmart-f6758-default-rtdb.firebaseio.com"
 FARM_ID = "Kisan1"
 
+# Pooled keep-alive session, so repeated fetches skip the TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Open-Meteo responses keyed by the hour they were fetched in
+_FORECAST_CACHE = {}
+
+FEATURE_ORDER = (
+    'api_temp', 'api_humidity', 'api_pressure', 'api_wind_speed',
+    'api_dew_spread', 'pressure_trend', 'wind_sin', 'wind_cos',
+    'sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed',
+    'sensor_dew_spread',
+    'month', 'hour', 'pressure_diff', 'temp_diff'
+)
+
+# Column positions in FEATURE_ORDER (must match the training feature list)
+(A_TEMP, A_HUM, A_PRES, A_WSPD,
+ A_DEW_SPREAD, P_TREND, WIND_SIN, WIND_COS,
+ S_TEMP, S_HUM, S_PRES, S_WSPD,
+ S_DEW_SPREAD,
+ MONTH, HOUR, P_DIFF, T_DIFF) = range(len(FEATURE_ORDER))
+
+RUN_INTERVAL_SECONDS = 3 * 60
+
 
 def init_firebase():
     if not firebase_admin._apps:
@@ -50,8 +75,17 @@ def get_live_forecast():
     )
 
     try:
-        r = requests.get(url).json()
         current_hour_iso = datetime.now().strftime("%Y-%m-%dT%H:00")
+        r = _FORECAST_CACHE.get(current_hour_iso)
+        if r is None:
+            resp = _SESSION.get(url, timeout=5)
+            resp.raise_for_status()
+            r = resp.json()
+            # Only cache a body that actually carries the hourly forecast
+            if 'hourly' not in r:
+                raise ValueError(f"no hourly data in response: {r.get('reason', r)}")
+            _FORECAST_CACHE.clear()
+            _FORECAST_CACHE[current_hour_iso] = r
         hourly_times = r['hourly']['time']
 
         try:
@@ -83,83 +117,91 @@ def read_sensors():
     }
 
 
-def main():
-    print(f"\nSIKKIM RAIN PREDICTOR - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-    try:
-        model = xgb.Booster()
-        model.load_model(MODEL_FILE)
-    except Exception as e:
-        print(f"Error loading model: {e}")
-        return
+class Predictor:
+    """Loads the booster once and reuses a single-row input buffer."""
 
-    api_data = get_live_forecast()
-    if not api_data:
-        return
+    def __init__(self, model_file=MODEL_FILE):
+        self.model = xgb.Booster()
+        self.model.load_model(model_file)
+        self.buf = np.empty(len(FEATURE_ORDER), dtype=np.float32)
 
-    sensor_data = read_sensors()
-    current_time = datetime.now()
-
-    rads = np.deg2rad(api_data['api_wind_dir'])
-
-    api_dew_spread = api_data['api_temp'] - api_data['api_dew_point']
-    sensor_dew_spread = sensor_data['sensor_temp'] - ((100 - sensor_data['sensor_humidity']) / 5)
-
-    pressure_diff = api_data['api_pressure'] - sensor_data['sensor_pressure']
-    temp_diff = api_data['api_temp'] - sensor_data['sensor_temp']
-
-    pressure_trend = 0.0
-
-    input_dict = {
-        'api_temp': api_data['api_temp'],
-        'api_humidity': api_data['api_humidity'],
-        'api_pressure': api_data['api_pressure'],
-        'api_wind_speed': api_data['api_wind_speed'],
-        'api_dew_spread': api_dew_spread,
-        'pressure_trend': pressure_trend,
-        'wind_sin': np.sin(rads),
-        'wind_cos': np.cos(rads),
-        'sensor_temp': sensor_data['sensor_temp'],
-        'sensor_humidity': sensor_data['sensor_humidity'],
-        'sensor_pressure': sensor_data['sensor_pressure'],
-        'sensor_wind_speed': sensor_data['sensor_wind_speed'],
-        'sensor_dew_spread': sensor_dew_spread,
-        'month': current_time.month,
-        'hour': current_time.hour,
-        'pressure_diff': pressure_diff,
-        'temp_diff': temp_diff
-    }
+    def predict(self, api_data, sensor_data):
+        current_time = datetime.now()
+
+        rads = np.deg2rad(api_data['api_wind_dir'])
+
+        api_dew_spread = api_data['api_temp'] - api_data['api_dew_point']
+        sensor_dew_spread = sensor_data['sensor_temp'] - ((100 - sensor_data['sensor_humidity']) / 5)
 
-    feature_order = [
-        'api_temp', 'api_humidity', 'api_pressure', 'api_wind_speed',
-        'api_dew_spread', 'pressure_trend', 'wind_sin', 'wind_cos',
-        'sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed',
-        'sensor_dew_spread',
-        'month', 'hour', 'pressure_diff', 'temp_diff'
-    ]
+        pressure_diff = api_data['api_pressure'] - sensor_data['sensor_pressure']
+        temp_diff = api_data['api_temp'] - sensor_data['sensor_temp']
 
+        pressure_trend = 0.0
+
+        x = self.buf
+        x[A_TEMP] = api_data['api_temp']
+        x[A_HUM] = api_data['api_humidity']
+        x[A_PRES] = api_data['api_pressure']
+        x[A_WSPD] = api_data['api_wind_speed']
+        x[A_DEW_SPREAD] = api_dew_spread
+        x[P_TREND] = pressure_trend
+        x[WIND_SIN] = np.sin(rads)
+        x[WIND_COS] = np.cos(rads)
+        x[S_TEMP] = sensor_data['sensor_temp']
+        x[S_HUM] = sensor_data['sensor_humidity']
+        x[S_PRES] = sensor_data['sensor_pressure']
+        x[S_WSPD] = sensor_data['sensor_wind_speed']
+        x[S_DEW_SPREAD] = sensor_dew_spread
+        x[MONTH] = current_time.month
+        x[HOUR] = current_time.hour
+        x[P_DIFF] = pressure_diff
+        x[T_DIFF] = temp_diff
+
+        return self.model.inplace_predict(x.reshape(1, -1))[0]
+
+    def predict_and_upload(self):
+        print(f"\nSIKKIM RAIN PREDICTOR - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+
+        api_data = get_live_forecast()
+        if not api_data:
+            return
+
+        sensor_data = read_sensors()
+
+        probability = self.predict(api_data, sensor_data)
+        percentage = int(probability * 100)
+
+        x = self.buf
+        print("\n" + "=" * 30)
+        print(f"FORECAST ANALYSIS")
+        print(f"   API reading: {api_data['api_temp']}°C, {api_data['api_humidity']}% RH")
+        print(f"   Sensor reading:  {sensor_data['sensor_temp']}°C, {sensor_data['sensor_humidity']}% RH")
+        print(f"   Physics Check:   Dew Spread={x[S_DEW_SPREAD]:.1f}, "
+              f"P-Diff={x[P_DIFF]:.1f}")
+        print("=" * 30)
+
+        if percentage > 50:
+            print(f"\nRAIN ALERT: {percentage}% Probability")
+        else:
+            print(f"\nNO RAIN: {percentage}% Probability")
+        print("=" * 30)
+        upload_rain_percent_to_firebase(percentage)
+
+
+def main():
     try:
-        input_df = pd.DataFrame([input_dict])[feature_order]
-    except KeyError as e:
-        print(f"CRITICAL ERROR: Missing feature in input dictionary: {e}")
+        predictor = Predictor()
+    except Exception as e:
+        print(f"Error loading model: {e}")
         return
 
-    dmatrix = xgb.DMatrix(input_df)
-    probability = model.predict(dmatrix)[0]
-    percentage = int(probability * 100)
-
-    print("\n" + "=" * 30)
-    print(f"FORECAST ANALYSIS")
-    print(f"   API reading: {api_data['api_temp']}°C, {api_data['api_humidity']}% RH")
-    print(f"   Sensor reading:  {sensor_data['sensor_temp']}°C, {sensor_data['sensor_humidity']}% RH")
-    print(f"   Physics Check:   Dew Spread={sensor_dew_spread:.1f}, P-Diff={pressure_diff:.1f}")
-    print("=" * 30)
-
-    if percentage > 50:
-        print(f"\nRAIN ALERT: {percentage}% Probability")
-    else:
-        print(f"\nNO RAIN: {percentage}% Probability")
-    print("=" * 30)
-    upload_rain_percent_to_firebase(percentage)
+    while True:
+        # One failed cycle (RTDB/API hiccup) must not take the service down
+        try:
+            predictor.predict_and_upload()
+        except Exception as e:
+            print(f"Prediction cycle error: {e}")
+        time.sleep(RUN_INTERVAL_SECONDS)
 
 
 if __name__ == "__main__":
@@ -1,21 +1,16 @@
 import pandas as pd
 import xgboost as xgb
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
 
 FILE_RP5 = "42348.01.01.2018.08.12.2025.1.0.0.en.ansi.00000000.csv"
 
+# Numeric RP5 columns are parsed straight into float32; RRR stays text ('Trace of precipitation')
+RP5_DTYPES = {'T': 'float32', 'U': 'float32', 'Po': 'float32', 'Ff': 'float32'}
+
 
 def clean_rp5(file_path):
     print(f"Cleaning RP5 (Sensor Data)...")
-    try:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False)
-    except:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False)
-
-    df.columns = [c.replace('"', '').strip() for c in df.columns]
-
     rename_map = {
         'Local time in Jaipur / Sanganer (airport)': 'timestamp',
         'T': 'sensor_temp',
@@ -24,17 +19,27 @@ def clean_rp5(file_path):
         'Ff': 'sensor_wind_speed',
         'Po': 'sensor_pressure'
     }
+
+    try:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+    except:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+
+    df.columns = [c.replace('"', '').strip() for c in df.columns]
+
     df = df.rename(columns=rename_map)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce')
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce', cache=True)
 
     # Fix Numeric Columns
     if 'sensor_rain' in df.columns:
-        df['sensor_rain'] = df['sensor_rain'].astype(str).str.replace('Trace of precipitation', '0.05', regex=False)
+        df['sensor_rain'] = df['sensor_rain'].replace('Trace of precipitation', '0.05')
         df['sensor_rain'] = pd.to_numeric(df['sensor_rain'], errors='coerce').fillna(0.0)
 
-    for col in ['sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed']:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    cols_to_fix = [c for c in ['sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed']
+                   if c in df.columns]
+    df[cols_to_fix] = df[cols_to_fix].apply(pd.to_numeric, errors='coerce')
 
     df = df.dropna(subset=['timestamp'])
     return df.sort_values('timestamp')
@@ -49,14 +54,21 @@ if __name__ == "__main__":
 
         print("Adding Sensor-Only Physics...")
 
-        df['month'] = df['timestamp'].dt.month
-        df['hour'] = df['timestamp'].dt.hour
-
-        df['pressure_trend'] = df['sensor_pressure'].diff().fillna(0)
+        temp = df['sensor_temp'].to_numpy()
+        hum = df['sensor_humidity'].to_numpy()
+        wspd = df['sensor_wind_speed'].to_numpy()
 
-        df['dew_spread'] = df['sensor_temp'] - ((100 - df['sensor_humidity']) / 5)
+        # Gaps in the station pressure give NaN steps; zero them in place like fillna(0) did
+        p = df['sensor_pressure'].to_numpy(np.float32)
+        ptrend = np.nan_to_num(np.diff(p, prepend=p[0]), copy=False)
 
-        df['storm_index'] = (df['pressure_trend'] * -1) * df['sensor_wind_speed']
+        df = df.assign(
+            month=df['timestamp'].dt.month,
+            hour=df['timestamp'].dt.hour,
+            pressure_trend=ptrend,
+            dew_spread=temp - ((100 - hum) / 5),
+            storm_index=-ptrend * wspd
+        )
 
         features = [
             'sensor_temp', 'sensor_humidity', 'sensor_pressure', 'sensor_wind_speed',
@@ -65,24 +77,44 @@ if __name__ == "__main__":
 
         df['target'] = (df['future_rain'] > 0.1).astype(int)
 
-        X = df[features]
-        y = df['target']
+        X = df[features].to_numpy(np.float32)
+        y = df['target'].to_numpy(np.int8)
 
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+        # Chronological 80/20 split (no shuffling)
+        n = int(len(X) * 0.8)
+        X_train, X_test, y_train, y_test = X[:n], X[n:], y[:n], y[n:]
 
         ratio = float(np.sum(y_train == 0)) / np.sum(y_train == 1)
 
-        model = xgb.XGBClassifier(
-            n_estimators=300,
-            learning_rate=0.03,
-            max_depth=6,
-            scale_pos_weight=np.sqrt(ratio)
-        )
+        params = {
+            'objective': 'binary:logistic',
+            'eta': 0.03,
+            'max_depth': 6,
+            'scale_pos_weight': np.sqrt(ratio),
+            'tree_method': 'hist',
+            'max_bin': 256,
+            'nthread': -1,
+            'eval_metric': 'logloss'
+        }
+
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train,
+                                     feature_names=features, max_bin=params['max_bin'])
+        dvalid = xgb.QuantileDMatrix(X_test, label=y_test,
+                                     feature_names=features, ref=dtrain)
 
         print("Training Standalone Sensor Model...")
-        model.fit(X_train, y_train)
+        model = xgb.train(
+            params, dtrain,
+            num_boost_round=300,
+            evals=[(dvalid, 'validation')],
+            early_stopping_rounds=20,
+            verbose_eval=False
+        )
+
+        model = model[: model.best_iteration + 1]
 
-        preds = model.predict(X_test)
+        proba = model.predict(dvalid)
+        preds = (proba > 0.5).astype(int)
         print(f"\nAccuracy (Predicting Next 3 Hours): {accuracy_score(y_test, preds) * 100:.1f}%")
         print(classification_report(y_test, preds))
 
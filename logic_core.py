@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import math
 import datetime
 
@@ -6,51 +7,67 @@ SOIL_FC = 32.0
 SOIL_WP = 16.0
 LATITUDE = 26.9
 
+_LAT_RAD = math.radians(LATITUDE)
+
+
+def _extraterrestrial_radiation(days):
+    """Ra at LATITUDE for a day-of-year (scalar or array)."""
+    dr = 1 + 0.033 * np.cos(2 * np.pi * days / 365)
+    decl = 0.409 * np.sin((2 * np.pi * days / 365) - 1.39)
+    ws = np.arccos(-np.tan(_LAT_RAD) * np.tan(decl))
+    return (24 * 60 / np.pi) * 0.0820 * dr * (
+            ws * np.sin(_LAT_RAD) * np.sin(decl) +
+            np.cos(_LAT_RAD) * np.cos(decl) * np.sin(ws)
+    )
+
+
+# Extraterrestrial radiation (Ra) for day-of-year 1..366 at LATITUDE; only the
+# temperature term of Hargreaves ET0 changes between calls.
+RA_TABLE = _extraterrestrial_radiation(np.arange(1, 367))
+
 
 class MaizeSmartIrrigation:
     def __init__(self, csv_path):
         self.schedule = self._load_schedule(csv_path)
+        self._last_pos = None  # Row of the previous stage hit (stages change slowly)
 
     def _load_schedule(self, path):
         """Loads and processes the CSV into a lookup table."""
         try:
             df = pd.read_csv(path)
-            processed = []
-            for _, row in df.iterrows():
-                # Parse '0-14' into start/end
-                d_start, d_end = map(float, str(row['Period_Days']).split('-'))
-
-                # Parse '10-18°C' into Max Reference Temp
-                t_str = str(row['Temp_Range_C']).replace('°C', '')
-                t_max_ref = float(t_str.split('-')[1])
-
-                # Parse '50-60%' into Base Target (Average)
-                m_str = str(row['Moisture_Target_Range']).replace('%', '')
-                m_min, m_max = map(float, m_str.split('-'))
-                base_target = (m_min + m_max) / 2
-
-                processed.append({
-                    'start': d_start, 'end': d_end,
-                    'stage': row['Stage'],
-                    'theta_base': base_target,
-                    'temp_max_ref': t_max_ref,
-                    'root_depth': float(row['Root_Depth_mm'])
-                })
-            return pd.DataFrame(processed)
+
+            # Parse '0-14' into start/end
+            periods = df['Period_Days'].str.extract(r'(\d+\.?\d*)-(\d+\.?\d*)').astype(float)
+
+            # Parse '10-18°C' into Max Reference Temp
+            t_max_ref = df['Temp_Range_C'].str.extract(r'-(\d+\.?\d*)')[0].astype(float)
+
+            # Parse '50-60%' into Base Target (Average)
+            moisture = df['Moisture_Target_Range'].str.extract(r'(\d+\.?\d*)-(\d+\.?\d*)%').astype(float)
+            m_min, m_max = moisture[0], moisture[1]
+
+            schedule = pd.DataFrame({
+                'start': periods[0], 'end': periods[1],
+                'stage': df['Stage'],
+                'theta_base': (m_min + m_max) / 2,
+                'temp_max_ref': t_max_ref,
+                'root_depth': df['Root_Depth_mm'].astype(float)
+            })
+
+            # Index rows by their [start, end) day interval for binary-search lookup
+            return schedule.set_index(
+                pd.IntervalIndex.from_arrays(schedule['start'], schedule['end'], closed='left')
+            )
         except Exception as e:
             print(f"CSV Load Error: {e}")
             return pd.DataFrame()
 
     def estimate_solar_radiation(self, day_of_year, t_max, t_min):
-        lat_rad = math.radians(LATITUDE)
-        dr = 1 + 0.033 * math.cos(2 * math.pi * day_of_year / 365)
-        declination = 0.409 * math.sin((2 * math.pi * day_of_year / 365) - 1.39)
-
-        ws = math.acos(-math.tan(lat_rad) * math.tan(declination))
-        ra = (24 * 60 / math.pi) * 0.0820 * dr * (
-                ws * math.sin(lat_rad) * math.sin(declination) +
-                math.cos(lat_rad) * math.cos(declination) * math.sin(ws)
-        )
+        if 1 <= day_of_year <= 366:
+            ra = float(RA_TABLE[day_of_year - 1])
+        else:
+            # Outside the table: evaluate the formula directly (no negative-index wrap)
+            ra = float(_extraterrestrial_radiation(day_of_year))
 
         t_mean = (t_max + t_min) / 2
         et0 = 0.0023 * ra * (t_mean + 17.8) * math.sqrt(t_max - t_min)
@@ -62,10 +79,14 @@ class MaizeSmartIrrigation:
         The Main Decision Loop (Runs every 3 hours).
         """
 
-        stage_data = self.schedule[
-            (self.schedule['start'] <= day_after_sowing) &
-            (self.schedule['end'] > day_after_sowing)
-            ].iloc[0]
+        pos = self._last_pos
+        if pos is None or day_after_sowing not in self.schedule.index[pos]:
+            try:
+                pos = self.schedule.index.get_loc(day_after_sowing)
+            except KeyError:
+                raise IndexError("day_after_sowing outside the crop schedule") from None
+            self._last_pos = pos
+        stage_data = self.schedule.iloc[pos]
 
         target = stage_data['theta_base']
 
@@ -98,6 +119,53 @@ class MaizeSmartIrrigation:
             "Water_Required_mm": round(water_mm, 2)
         }
 
+    def batch_update(self, day_arr, t_cur, t_max, t_min, m_cur):
+        """
+        Vectorized calculate_3hr_update for many farms / ticks at once.
+        Takes arrays (or scalars) and returns one result row per input.
+        """
+        day_arr, t_cur, t_max, t_min, m_cur = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(a, dtype=float)) for a in (day_arr, t_cur, t_max, t_min, m_cur))
+        )
+
+        # Stages are contiguous and sorted, so the row is the first 'end' past the day
+        ends = self.schedule['end'].to_numpy()
+        rows = np.searchsorted(ends, day_arr, side='right')
+        if np.any(rows >= len(ends)) or np.any(day_arr < self.schedule['start'].iat[0]):
+            raise IndexError("day_after_sowing outside the crop schedule")
+
+        target = self.schedule['theta_base'].to_numpy()[rows]
+        temp_max_ref = self.schedule['temp_max_ref'].to_numpy()[rows]
+        root_depth = self.schedule['root_depth'].to_numpy()[rows]
+
+        instant_overshoot = np.maximum(0, t_cur - temp_max_ref)
+
+        # Match calculate_3hr_update (math.sqrt raises) instead of returning NaN
+        if np.any(t_max < t_min):
+            raise ValueError("math domain error: t_max is below t_min")
+
+        day_of_year = datetime.datetime.now().timetuple().tm_yday
+        ra = RA_TABLE[day_of_year - 1]
+        estimated_et0 = np.round(0.0023 * ra * ((t_max + t_min) / 2 + 17.8) * np.sqrt(t_max - t_min), 2)
+
+        et_buffer = np.where(estimated_et0 > 5.5, 5.0, 0.0)
+
+        final_target = np.minimum(90.0, target + (instant_overshoot * 2.0) + et_buffer)
+
+        deficit_pct = np.maximum(0.0, final_target - m_cur)
+        available_water_fraction = (SOIL_FC - SOIL_WP) / 100.0
+        water_mm = (deficit_pct / 100.0) * available_water_fraction * root_depth
+
+        return pd.DataFrame({
+            "Stage": self.schedule['stage'].to_numpy()[rows],
+            "Root_Depth": root_depth,
+            "Condition": np.where(instant_overshoot > 0, "Heat Stress", "Normal"),
+            "Solar_Demand_ET0": estimated_et0,
+            "Target_Moisture": np.round(final_target, 1),
+            "Current_Moisture": m_cur,
+            "Water_Required_mm": np.round(water_mm, 2)
+        })
+
 
 # --- SIMULATION (Example of one 3-hour check) ---
 system = MaizeSmartIrrigation('maize_data.csv')
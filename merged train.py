@@ -7,16 +7,12 @@ from sklearn.metrics import classification_report, accuracy_score
 FILE_RP5 = "42299.01.01.2018.02.12.2025.1.0.0.en.ansi.00000000.csv"
 FILE_API = "open-meteo-27.31N88.59E1636m(1).csv"
 
+# Numeric RP5 columns are parsed straight into float32; RRR stays text ('Trace of precipitation')
+RP5_DTYPES = {'T': 'float32', 'U': 'float32', 'Po': 'float32', 'Ff': 'float32'}
+
 
 def clean_rp5(file_path):
     print(f"Cleaning RP5 (Ground Truth)...")
-    try:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False)
-    except:
-        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False)
-
-    df.columns = [c.replace('"', '').strip() for c in df.columns]
-
     rename_map = {
         'Local time in Gangtok': 'timestamp',
         'T': 'sensor_temp',
@@ -25,6 +21,16 @@ def clean_rp5(file_path):
         'Po': 'sensor_pressure',
         'Ff': 'sensor_wind_speed'
     }
+
+    try:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='ansi', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+    except:
+        df = pd.read_csv(file_path, sep=';', skiprows=6, encoding='utf-8', index_col=False,
+                         usecols=list(rename_map), dtype=RP5_DTYPES)
+
+    df.columns = [c.replace('"', '').strip() for c in df.columns]
+
     df = df.rename(columns=rename_map)
 
     df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d.%m.%Y %H:%M', errors='coerce')
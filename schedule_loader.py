@@ -0,0 +1,63 @@
+import pandas as pd
+import numpy as np
+
+# ---------------------------------------------------------------------
+#                  CROP SCHEDULE: CSV -> NUMPY ARRAYS
+# ---------------------------------------------------------------------
+# Run once whenever maize_data.csv changes; irrigation_runtime.py only
+# loads the resulting .npz, so the control loop never imports pandas.
+CSV_PATH = "maize_data.csv"
+NPZ_PATH = "schedule.npz"
+
+
+def load_schedule(path=CSV_PATH):
+    df = pd.read_csv(
+        path,
+        usecols=["Period_Days", "Temp_Range_C", "Moisture_Target_Range", "Stage", "Root_Depth_mm"],
+        dtype={"Period_Days": "string", "Temp_Range_C": "string", "Moisture_Target_Range": "string",
+               "Stage": "string", "Root_Depth_mm": "float32"}
+    )
+
+    period = df["Period_Days"].str.split("-", expand=True).astype(float)
+
+    t_max_ref = df["Temp_Range_C"].str.replace("°C", "", regex=False).str.split("-", expand=True)[1].astype(float)
+
+    m = df["Moisture_Target_Range"].str.replace("%", "", regex=False).str.split("-", expand=True).astype(float)
+    base_target = (m[0] + m[1]) / 2
+
+    schedule = pd.DataFrame({
+        "start": period[0], "end": period[1],
+        "stage": df["Stage"],
+        "theta_base": base_target,
+        "temp_max_ref": t_max_ref,
+        "root_depth": df["Root_Depth_mm"]
+    })
+
+    # A few dozen small values and a handful of stage names: keep them compact
+    for col in ("start", "end", "theta_base", "temp_max_ref", "root_depth"):
+        schedule[col] = pd.to_numeric(schedule[col], downcast="float")
+    schedule["stage"] = schedule["stage"].astype("category")
+    return schedule
+
+
+def schedule_arrays(path=CSV_PATH):
+    """Column arrays for the runtime (stages are sorted and contiguous)."""
+    schedule = load_schedule(path)
+    return {
+        "start": schedule["start"].to_numpy(),
+        "end": schedule["end"].to_numpy(),
+        "theta_base": schedule["theta_base"].to_numpy(),
+        "temp_max_ref": schedule["temp_max_ref"].to_numpy(),
+        "root_depth": schedule["root_depth"].to_numpy(),
+        # Fixed-width unicode rather than object, so np.load needs no pickle
+        "stage": schedule["stage"].to_numpy(dtype=str)
+    }
+
+
+def save_schedule(csv_path=CSV_PATH, npz_path=NPZ_PATH):
+    np.savez(npz_path, **schedule_arrays(csv_path))
+
+
+if __name__ == "__main__":
+    save_schedule()
+    print(f"Wrote {NPZ_PATH} from {CSV_PATH}")